@@ -1,9 +1,79 @@
 # clients/base_client.py
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Optional
 import logging
+import random
+import re
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # orjson parses the frequent job status responses considerably faster
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for the delay between two job status polls (seconds)
+MAX_POLL_INTERVAL = 30.0
+
+# With DEBUG logging, every this many polls the status is also validated against the SDK model
+STATUS_VALIDATION_INTERVAL = 100
+
+# (connect, read) timeouts in seconds for direct file transfers
+HTTP_TIMEOUT = (10, 300)
+
+# Block size used when streaming file bodies to the socket (http.client default is 8 KiB)
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+
+# Default number of keep-alive connections kept per host for direct file transfers
+TRANSFER_POOL_MAXSIZE = 32
+
+_CAMEL_RE = re.compile(r'([A-Z]+)')
+
+
+@lru_cache(maxsize=256)
+def _to_snake_case(class_name: str) -> str:
+    """
+    Convert PascalCase to snake_case for module names.
+    
+    Args:
+        class_name: Class name in PascalCase (e.g., 'JobsApi')
+        
+    Returns:
+        Module name in snake_case (e.g., 'jobs_api')
+    """
+    # Insert underscore before uppercase letters and convert to lowercase
+    return _CAMEL_RE.sub(r'_\1', class_name).lower().lstrip('_')
+
+
+@lru_cache(maxsize=256)
+def _to_pascal_case(name: str) -> str:
+    """
+    Convert snake_case attribute names to PascalCase class names.
+    
+    Args:
+        name: Attribute name in snake_case (e.g., 'jobs_api')
+        
+    Returns:
+        Class name in PascalCase (e.g., 'JobsApi')
+    """
+    return ''.join(word.capitalize() for word in name.split('_'))
+
+
+class _TransferAdapter(HTTPAdapter):
+    """HTTPAdapter that streams file request bodies in large blocks."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        # Connection blocksize is only accepted as a pool key by urllib3 2.x
+        if int(urllib3.__version__.split('.')[0]) >= 2:
+            kwargs.setdefault('blocksize', UPLOAD_BLOCK_SIZE)
+        super().init_poolmanager(*args, **kwargs)
+
 
 class BaseClient:
     """
@@ -25,18 +95,75 @@ class BaseClient:
         config = Configuration()
         if host:
             config.host = host
+
+        # Keep the SDK's urllib3 pool large enough for concurrent use and retry
+        # transient server errors on idempotent calls; the final response is still
+        # returned so the SDK can raise its own ApiException
+        config.connection_pool_maxsize = 16
+        config.retries = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False
+        )
         
         # Create API client
         self._api_client = ApiClient(configuration=config)
         self._api_cache = {}
+        self._api_miss = set()
+
+        # Shared HTTP session for direct file transfers (downloads, presigned uploads),
+        # so keep-alive connections are reused across calls instead of reconnecting
+        self._http = requests.Session()
+        self._mount_transfer_adapter(TRANSFER_POOL_MAXSIZE)
+        self.http_timeout = HTTP_TIMEOUT
         
         # Exchange token for bearer token
         self.exchange_token(api_token)
+
+        # Bind the most used APIs as plain attributes so hot paths (e.g. status
+        # polling) don't go through __getattr__
+        self.authentication_api = self._get_api('AuthenticationApi')
+        self.jobs_api = self._get_api('JobsApi')
+        self.data_upload_api = self._get_api('DataUploadApi')
     
+    def _mount_transfer_adapter(self, pool_maxsize: int) -> None:
+        """
+        Mount the file transfer adapter on the shared HTTP session.
+
+        Args:
+            pool_maxsize: Number of connections kept per host; it should not be lower
+                than the number of concurrent transfers, or connections are discarded
+                and reopened
+        """
+        adapter = _TransferAdapter(
+            pool_connections=16,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET", "PUT"]
+            )
+        )
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
+
     @property
     def api_client(self):
         """Access to the raw API client."""
         return self._api_client
+
+    def close(self) -> None:
+        """Close the underlying HTTP sessions and release pooled connections."""
+        self._http.close()
+        self._api_client.rest_client.pool_manager.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
     
     def exchange_token(self, api_token: str) -> str:
         """
@@ -72,6 +199,73 @@ class BaseClient:
         
         return bearer_token
     
+    def _fetch_job_status(self, job_id: str, job_type: str, poll: int = 0) -> dict:
+        """
+        Fetch the status of a job as a plain dictionary.
+
+        Used by the polling loops: the raw response is parsed directly instead
+        of being deserialized into the SDK model on every poll. Only the first
+        poll (and, with DEBUG logging, every STATUS_VALIDATION_INTERVAL-th one)
+        is validated against the model, so schema changes still surface early.
+
+        Args:
+            job_id: The ID of the job
+            job_type: The job type (e.g. 'dataDump', 'dataPull')
+            poll: Number of status checks of this job done before this one
+
+        Returns:
+            Job status response as a dictionary
+
+        Raises:
+            ApiException: If the status request fails
+            ValidationError: If a validated response does not match the SDK model
+        """
+        response = self.jobs_api.get_job_status_without_preload_content(job_id, type=job_type)
+        try:
+            if response.status != 200:
+                # Raise the SDK's usual ApiException (subclass) from the response at hand
+                from cm_python_openapi_sdk.exceptions import ApiException
+                ApiException.from_response(
+                    http_resp=response,
+                    body=response.data.decode('utf-8', errors='replace'),
+                    data=None
+                )
+            job_status = json_loads(response.data)
+        finally:
+            response.release_conn()
+
+        if poll == 0 or (poll % STATUS_VALIDATION_INTERVAL == 0 and logger.isEnabledFor(logging.DEBUG)):
+            from cm_python_openapi_sdk import JobDetailResponse
+            JobDetailResponse.from_dict(job_status)
+
+        return job_status
+
+    @staticmethod
+    def _poll_delays(
+        poll_interval: float,
+        max_interval: float = MAX_POLL_INTERVAL,
+        backoff: float = 1.5
+    ) -> Iterator[float]:
+        """
+        Generate sleep durations for job status polling.
+
+        Starts at poll_interval and backs off exponentially up to max_interval,
+        with a small random jitter so concurrent pollers don't synchronize.
+
+        Args:
+            poll_interval: Initial delay in seconds
+            max_interval: Upper bound for the delay in seconds
+            backoff: Factor the delay grows by after each poll
+
+        Yields:
+            Seconds to sleep before the next status check
+        """
+        delay = poll_interval
+        max_delay = max(max_interval, poll_interval)
+        while True:
+            yield delay + random.uniform(0, delay * 0.1)
+            delay = min(delay * backoff, max_delay)
+
     def _get_api(self, api_class_name: str):
         """
         Helper to lazily instantiate API classes.
@@ -85,26 +279,11 @@ class BaseClient:
         if api_class_name not in self._api_cache:
             # Dynamically import the API class
             import importlib
-            module = importlib.import_module(f'cm_python_openapi_sdk.api.{self._to_snake_case(api_class_name)}')
+            module = importlib.import_module(f'cm_python_openapi_sdk.api.{_to_snake_case(api_class_name)}')
             api_class = getattr(module, api_class_name)
             self._api_cache[api_class_name] = api_class(self._api_client)
         return self._api_cache[api_class_name]
     
-    def _to_snake_case(self, class_name: str) -> str:
-        """
-        Convert PascalCase to snake_case for module names.
-        
-        Args:
-            class_name: Class name in PascalCase (e.g., 'JobsApi')
-            
-        Returns:
-            Module name in snake_case (e.g., 'jobs_api')
-        """
-        import re
-        # Insert underscore before uppercase letters and convert to lowercase
-        snake = re.sub('([A-Z]+)', r'_\1', class_name).lower()
-        return snake.lstrip('_')
-    
     def __getattr__(self, name: str):
         """
         Automatically expose all *Api classes from generated SDK.
@@ -120,11 +299,14 @@ class BaseClient:
             AttributeError: If the attribute doesn't exist
         """
         if name.endswith('_api'):
-            # Convert snake_case to PascalCase
-            class_name = ''.join(word.capitalize() for word in name.split('_'))
-            try:
-                return self._get_api(class_name)
-            except (ImportError, AttributeError):
-                pass
+            # Names that already failed to resolve are not looked up again
+            api_miss = object.__getattribute__(self, '_api_miss')
+            if name not in api_miss:
+                # Convert snake_case to PascalCase
+                class_name = _to_pascal_case(name)
+                try:
+                    return self._get_api(class_name)
+                except (ImportError, AttributeError):
+                    api_miss.add(name)
         
         raise AttributeError(f"'{type(self).__name__}' has no attribute '{name}'")
@@ -2,14 +2,15 @@
 import time
 import os
 import logging
+import shutil
 from typing import Optional
 
-import requests
-
 from . import BaseClient
 
 logger = logging.getLogger(__name__)
 
+_DATA_DUMP = "dataDump"
+
 
 class DataDumpClient(BaseClient):
     def dump_dataset_to_csv(
@@ -17,7 +18,7 @@ class DataDumpClient(BaseClient):
         project_id: str, 
         dataset: str, 
         output_path: str,
-        poll_interval: int = 5
+        poll_interval: float = 1
     ) -> str:
         """
         Dump a dataset to a CSV file.
@@ -31,7 +32,8 @@ class DataDumpClient(BaseClient):
             project_id: The ID of the project containing the dataset
             dataset: The name of the dataset to dump
             output_path: Directory path where to save the CSV file
-            poll_interval: Seconds between status checks (default: 5)
+            poll_interval: Initial seconds between status checks, backed off
+                exponentially while the job runs (default: 1)
         
         Returns:
             Path to the downloaded CSV file
@@ -56,7 +58,7 @@ class DataDumpClient(BaseClient):
         )
         
         job_request = DataDumpJobRequest(
-            type="dataDump",
+            type=_DATA_DUMP,
             projectId=project_id,
             content=data_dump_request
         )
@@ -74,7 +76,7 @@ class DataDumpClient(BaseClient):
         self._wait_for_job_completion(job_id, poll_interval)
         
         # Get the result file URL and download
-        job_status = self.jobs_api.get_job_status(job_id, type="dataDump")
+        job_status = self.jobs_api.get_job_status(job_id, type=_DATA_DUMP)
         result_url = job_status.result.get("links")[0].get("href")
         
         if not result_url:
@@ -94,40 +96,45 @@ class DataDumpClient(BaseClient):
     def _wait_for_job_completion(
         self, 
         job_id: str, 
-        poll_interval: int = 5,
-        timeout: Optional[int] = None
+        poll_interval: float = 1,
+        timeout: Optional[int] = None,
+        max_polls: Optional[int] = None
     ) -> None:
         """
         Poll for job completion until it succeeds or fails.
         
         Args:
             job_id: The ID of the job to monitor
-            poll_interval: Seconds between status checks
+            poll_interval: Initial seconds between status checks (backed off exponentially)
             timeout: Maximum seconds to wait (None for no timeout)
+            max_polls: Maximum number of status checks before giving up (None for no limit)
         
         Raises:
             Exception: If the job fails
-            TimeoutError: If timeout is reached
+            TimeoutError: If timeout or max_polls is reached
         """
         start_time = time.time()
         
-        while True:
-            job_status = self.jobs_api.get_job_status(job_id, type="dataDump")
-            logger.debug(f"Current job status: {job_status.status}")
+        for poll, delay in enumerate(self._poll_delays(poll_interval)):
+            job_status = self._fetch_job_status(job_id, _DATA_DUMP, poll)
+            logger.debug(f"Current job status: {job_status['status']}")
             
-            if job_status.status == "SUCCEEDED":
+            if job_status['status'] == "SUCCEEDED":
                 logger.debug("Job completed successfully")
                 return
-            elif job_status.status == "FAILED":
-                error_msg = f"Job failed: {job_status.message}"
+            elif job_status['status'] == "FAILED":
+                error_msg = f"Job failed: {job_status.get('message')}"
                 logger.error(error_msg)
                 raise Exception(error_msg)
             
             # Check timeout
             if timeout and (time.time() - start_time) > timeout:
                 raise TimeoutError(f"Job {job_id} did not complete within {timeout} seconds")
+
+            if max_polls is not None and poll + 1 >= max_polls:
+                raise TimeoutError(f"Job {job_id} did not complete within the maximum number of status checks")
             
-            time.sleep(poll_interval)
+            time.sleep(delay)
     
     def _download_file(self, result_url: str, local_filename: str) -> None:
         """
@@ -152,11 +159,13 @@ class DataDumpClient(BaseClient):
             headers = {
                 'Authorization': f"Bearer {self.api_client.configuration.access_token}"
             }
-            response = requests.get(full_url, headers=headers)
-            response.raise_for_status()
-            
-            with open(local_filename, 'wb') as f:
-                f.write(response.content)
+            with self._http.get(full_url, headers=headers, stream=True, timeout=self.http_timeout) as response:
+                response.raise_for_status()
+
+                # Stream the body straight to disk instead of buffering it in memory
+                response.raw.decode_content = True
+                with open(local_filename, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, length=1024 * 1024)
             
             logger.debug(f"File downloaded successfully: {local_filename}")
             
@@ -175,4 +184,4 @@ class DataDumpClient(BaseClient):
         Returns:
             Job status response
         """
-        return self.jobs_api.get_job_status(job_id, type="dataDump")
+        return self.jobs_api.get_job_status(job_id, type=_DATA_DUMP)
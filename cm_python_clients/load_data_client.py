@@ -1,18 +1,120 @@
 # clients/load_data_client.py
-import gzip
+import base64
+import hashlib
+import io
 import logging
+import mmap
 import os
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-import requests
+try:
+    # ISA-L provides a much faster, API-compatible DEFLATE implementation
+    from isal import igzip as gzip
+except ImportError:
+    import gzip
 
 from cm_python_openapi_sdk import DataPullRequestCsvOptions, DataPullRequest, DataPullJobRequest, GeneralJobRequest, \
     JobDetailResponse, DataUpload200Response
 from . import BaseClient
+from .base_api_client import TRANSFER_POOL_MAXSIZE
 
 logger = logging.getLogger(__name__)
 
+_DATA_PULL = "dataPull"
+
+# Data pull jobs are often short: poll early and often at first, but never wait
+# more than a few seconds between checks once they run longer
+DATA_PULL_POLL_INTERVAL = 0.25
+DATA_PULL_MAX_POLL_INTERVAL = 10.0
+
+# Files up to this size are uploaded with a single PUT; multipart upload only
+# pays off (extra init/complete round trips) for larger files
+SINGLE_PUT_THRESHOLD = 50 * 1024 * 1024
+
+# Multipart part sizing: aim for about TARGET_PART_COUNT parts, but keep each part
+# within [MIN_PART_SIZE, MAX_PART_SIZE]. Every uploader holds its whole compressed
+# part in memory, so the upper bound is kept small and very large files get more
+# parts instead, up to the storage limit of MAX_PART_COUNT parts
+TARGET_PART_COUNT = 1000
+MAX_PART_COUNT = 10000
+MIN_PART_SIZE = 16 * 1024 * 1024
+MAX_PART_SIZE = 128 * 1024 * 1024
+
+# Part size limits of the object storage, enforced on an explicit part_size
+STORAGE_MIN_PART_SIZE = 5 * 1024 * 1024
+STORAGE_MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+
+# Environment variable overriding the default number of parts uploaded in parallel
+MAX_CONCURRENT_PARTS_ENV = "CM_MAX_CONCURRENT_PARTS"
+
+# Number of parts read ahead of the uploaders during multipart upload
+PREFETCH_PARTS = 4
+
+# Seconds between checks of the stop flag while waiting on the part queue
+_QUEUE_POLL_INTERVAL = 0.5
+
+# Number of bytes read from the start of a CSV file to check that it is not empty
+HEADER_SNIFF_SIZE = 64 * 1024
+
+
+def _madvise(mm: mmap.mmap, advice_name: str, start: int, end: int) -> None:
+    """
+    Give the kernel a paging hint for mm[start:end], where the platform supports it.
+
+    Args:
+        mm: Memory map of the source file
+        advice_name: Name of the mmap.MADV_* constant
+        start: Offset of the first byte of the range
+        end: Offset one past the last byte of the range
+    """
+    advice = getattr(mmap, advice_name, None)
+    if advice is None or not hasattr(mm, 'madvise'):
+        return
+    page_start = start - start % mmap.PAGESIZE
+    mm.madvise(advice, page_start, end - page_start)
+
+
+def _check_csv_header(csv_file_path: str) -> None:
+    """
+    Check that the CSV file starts with a header row.
+
+    The length of the header row is not limited; wide tables can have headers
+    longer than HEADER_SNIFF_SIZE.
+
+    Args:
+        csv_file_path: Path to the CSV file
+
+    Raises:
+        ValueError: If the file is empty or starts with only whitespace
+    """
+    with open(csv_file_path, 'rb') as f:
+        head = f.read(HEADER_SNIFF_SIZE)
+
+    if not head.strip():
+        raise ValueError(f"CSV file is empty: {csv_file_path}")
+
+
+def adaptive_part_size(file_size: int) -> int:
+    """
+    Pick a multipart part size for a file.
+
+    Small files get MIN_PART_SIZE parts; larger files get bigger parts so the
+    number of parts stays around TARGET_PART_COUNT. Parts grow no larger than
+    MAX_PART_SIZE unless the file would need more than MAX_PART_COUNT parts.
+
+    Args:
+        file_size: Size of the file in bytes
+
+    Returns:
+        Part size in bytes
+    """
+    part_size = min(max(-(-file_size // TARGET_PART_COUNT), MIN_PART_SIZE), MAX_PART_SIZE)
+    return max(part_size, -(-file_size // MAX_PART_COUNT))
+
 
 class LoadDataClient(BaseClient):
     """
@@ -24,18 +126,40 @@ class LoadDataClient(BaseClient):
     - Job monitoring and status tracking
     """
     
-    def __init__(self, api_token: str, host: Optional[str] = None, chunk_size: int = 50 * 1024 * 1024):
+    def __init__(
+        self,
+        api_token: str,
+        host: Optional[str] = None,
+        chunk_size: int = SINGLE_PUT_THRESHOLD,
+        max_concurrent_parts: Optional[int] = None
+    ):
         """
         Initialize the LoadData client.
         
         Args:
             api_token: API access token (required)
             host: API host URL (optional, uses default if not provided)
-            chunk_size: Size in bytes for multipart upload chunks (default: 50MB)
+            chunk_size: Files up to this size in bytes are uploaded in a single request (default: 50MB)
+            max_concurrent_parts: Maximum number of parts uploaded in parallel
+                (default: $CM_MAX_CONCURRENT_PARTS, or 8)
+
+        Raises:
+            ValueError: If max_concurrent_parts is less than 1
         """
+        if max_concurrent_parts is None:
+            max_concurrent_parts = int(os.environ.get(MAX_CONCURRENT_PARTS_ENV, 8))
+        if max_concurrent_parts < 1:
+            raise ValueError(
+                f"Invalid max_concurrent_parts {max_concurrent_parts} "
+                f"(or ${MAX_CONCURRENT_PARTS_ENV}). Must be at least 1."
+            )
+
         super().__init__(api_token, host)
         self.chunk_size = chunk_size
-        self.target_part_size = 20 * 1024 * 1024  # 20MB target part size
+        self.max_concurrent_parts = max_concurrent_parts
+        if max_concurrent_parts > TRANSFER_POOL_MAXSIZE:
+            # Keep a connection per uploader so parts reuse their connections
+            self._mount_transfer_adapter(max_concurrent_parts)
         self.content_type = 'text/csv; charset=utf-8'
     
     def upload_data(
@@ -45,7 +169,9 @@ class LoadDataClient(BaseClient):
         dataset_name: str,
         mode: str = "full",
         poll_job: bool = True,
-        csv_options: DataPullRequestCsvOptions = DataPullRequestCsvOptions()
+        csv_options: DataPullRequestCsvOptions = DataPullRequestCsvOptions(),
+        part_size: Optional[int] = None,
+        encoding: Optional[str] = None
     ):
         """
         Upload a CSV file to the platform.
@@ -60,11 +186,18 @@ class LoadDataClient(BaseClient):
             mode: Data loading mode - "full" or "incremental" (default: "full")
             poll_job: Whether to wait for job completion (default: True)
             csv_options: csv options for data pull request (default: empty)
+            part_size: Size in bytes of multipart upload parts (default: chosen from the file size)
+            encoding: Set to "gzip" to also compress single-part uploads; multipart
+                parts are always GZIP compressed. The single-part body is compressed
+                in memory as a whole (at most chunk_size bytes of input), not
+                streamed (default: None)
         Returns:
             Job response object
         
         Raises:
             FileNotFoundError: If the CSV file doesn't exist
+            ValueError: If the CSV file is empty, or part_size is outside
+                the storage limits
             Exception: For API-related errors
         """
         if not os.path.exists(csv_file_path):
@@ -73,6 +206,17 @@ class LoadDataClient(BaseClient):
         if (mode != "full") and (mode != "incremental"):
             raise ValueError("Invalid data loading mode. Must be 'full' or 'incremental'.")
 
+        if encoding not in (None, "gzip"):
+            raise ValueError("Invalid encoding. Must be None or 'gzip'.")
+
+        if part_size is not None and not STORAGE_MIN_PART_SIZE <= part_size <= STORAGE_MAX_PART_SIZE:
+            raise ValueError(
+                f"Invalid part size. Must be between {STORAGE_MIN_PART_SIZE} and {STORAGE_MAX_PART_SIZE} bytes."
+            )
+
+        # Reject a malformed file before the server creates an upload for it
+        _check_csv_header(csv_file_path)
+
         logger.info(
             f"Uploading CSV file to project {project_id} "
             f"as dataset '{dataset_name}' in {mode} mode"
@@ -81,15 +225,27 @@ class LoadDataClient(BaseClient):
         file_size = os.path.getsize(csv_file_path)
         logger.debug(f"File size: {file_size} bytes")
         
-        # Choose the upload method based on file size
-        if file_size <= self.chunk_size:
+        # Calculate the number of parts based on the part size
+        if part_size is None:
+            part_size = adaptive_part_size(file_size)
+        parts = (file_size + part_size - 1) // part_size
+        if file_size > self.chunk_size and parts > MAX_PART_COUNT:
+            raise ValueError(
+                f"Part size {part_size} splits the file into {parts} parts, more than {MAX_PART_COUNT}."
+            )
+
+        # Choose the upload method based on file size; a file that would fit
+        # into one part is never sent through the multipart flow
+        if file_size <= self.chunk_size or parts <= 1:
             logger.debug("Using single-part upload")
-            job_response = self._single_part_upload(project_id, csv_file_path, dataset_name, mode, csv_options)
+            job_response = self._single_part_upload(
+                project_id, csv_file_path, file_size, dataset_name, mode, csv_options, encoding
+            )
         else:
-            # Calculate the number of parts based on the target part size
-            parts = (file_size + self.target_part_size - 1) // self.target_part_size
-            logger.debug(f"Using multipart upload with {parts} parts")
-            job_response = self._multipart_upload(project_id, csv_file_path, parts, dataset_name, mode, csv_options)
+            logger.debug(f"Using multipart upload with {parts} parts of {part_size} bytes")
+            job_response = self._multipart_upload(
+                project_id, csv_file_path, parts, part_size, dataset_name, mode, csv_options
+            )
         
         # Poll for job completion if requested
         if poll_job:
@@ -99,14 +255,16 @@ class LoadDataClient(BaseClient):
         
         return job_response
     
-    def _single_part_upload(self, project_id: str, csv_file_path: str, dataset_name: str, mode: str, csv_options: DataPullRequestCsvOptions):
+    def _single_part_upload(self, project_id: str, csv_file_path: str, file_size: int, dataset_name: str, mode: str, csv_options: DataPullRequestCsvOptions, encoding: Optional[str] = None):
         """
         Handle single-part upload for smaller files.
         
         Args:
             project_id: Project ID
             csv_file_path: Path to CSV file
+            file_size: Size of the CSV file in bytes
             dataset_name: Dataset name
+            encoding: "gzip" to compress the file before uploading, or None
         
         Returns:
             Job response
@@ -122,7 +280,7 @@ class LoadDataClient(BaseClient):
         logger.debug(f"Got upload URL {upload_url}")
         
         # Upload the file
-        self._upload_file(upload_url, csv_file_path)
+        self._upload_file(upload_url, csv_file_path, file_size, encoding)
 
         file_uri = self._get_file_uri_from_response(upload_response)
         
@@ -152,7 +310,7 @@ class LoadDataClient(BaseClient):
         )
 
         return DataPullJobRequest(
-            type="dataPull",
+            type=_DATA_PULL,
             projectId=project_id,
             content=data_pull_request
         )
@@ -162,6 +320,7 @@ class LoadDataClient(BaseClient):
         project_id: str, 
         csv_file_path: str, 
         parts: int,
+        part_size: int,
         dataset_name: str,
         mode: str,
         csv_options: DataPullRequestCsvOptions
@@ -173,6 +332,7 @@ class LoadDataClient(BaseClient):
             project_id: Project ID
             csv_file_path: Path to CSV file
             parts: Number of parts to split into
+            part_size: Maximum size of a part in bytes (the last part takes the rest)
             dataset_name: Dataset name
         
         Returns:
@@ -187,22 +347,48 @@ class LoadDataClient(BaseClient):
         # Get the upload URLs
         upload_urls = upload_response.actual_instance.upload_urls_encoded
         
-        uploaded_parts = []
-        
-        # Use CSVFileSplitter to split and upload
-        file_splitter = CSVFileSplitter(self.chunk_size)
-        with file_splitter as splitter:
-            for temp_file_path, part_number in splitter.split_file(csv_file_path, parts):
+        etags = {}
+        parts_queue = queue.Queue(maxsize=PREFETCH_PARTS)
+        stop = threading.Event()
+
+        # The file is memory-mapped and uploader threads compress their parts straight
+        # from the mapping, so no read buffers are needed. The calling thread finds the
+        # part boundaries (CSVFileSplitter) and queues a bounded number of parts ahead,
+        # asking the kernel to page them in while earlier parts are being uploaded.
+        file_splitter = CSVFileSplitter(part_size)
+        workers = min(self.max_concurrent_parts, parts)
+        with open(csv_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            _madvise(mm, 'MADV_SEQUENTIAL', 0, len(mm))
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                uploaders = [
+                    executor.submit(self._upload_parts_from_queue, parts_queue, mm, upload_urls, etags, stop)
+                    for _ in range(workers)
+                ]
                 try:
-                    logger.debug(f"Uploading part {part_number}/{parts}")
-                    etag = self._upload_part(upload_urls[part_number - 1], temp_file_path)
-                    uploaded_parts.append({
-                        "eTag": etag,
-                        "partNumber": part_number
-                    })
-                except Exception as e:
-                    logger.error(f"Failed to upload part {part_number}: {e}")
+                    for start, end, part_number in file_splitter.split_ranges(csv_file_path, parts):
+                        _madvise(mm, 'MADV_WILLNEED', start, end)
+                        logger.debug(f"Queueing part {part_number}/{parts}")
+                        if not self._put_until_stopped(parts_queue, (part_number, start, end), stop):
+                            break
+
+                    # One end marker per uploader
+                    for _ in uploaders:
+                        self._put_until_stopped(parts_queue, None, stop)
+                except BaseException:
+                    stop.set()
                     raise
+
+                for uploader in uploaders:
+                    uploader.result()
+
+        uploaded_parts = [
+            {
+                "eTag": etags[part_number],
+                "partNumber": part_number
+            }
+            for part_number in sorted(etags)
+        ]
         
         # Complete the multipart upload
         complete_request = DataCompleteMultipartUploadRequest(
@@ -223,19 +409,90 @@ class LoadDataClient(BaseClient):
         
         return self._submit_data_pull_request(job_request)
 
+    def _put_until_stopped(self, q: queue.Queue, item, stop: threading.Event) -> bool:
+        """
+        Put an item into a queue, giving up if the upload was stopped.
+
+        Returns:
+            True if the item was queued, False if the upload was stopped
+        """
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=_QUEUE_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get_until_stopped(self, q: queue.Queue, stop: threading.Event):
+        """
+        Take an item from a queue, giving up if the upload was stopped.
+
+        Returns:
+            The item, or None if the upload was stopped
+        """
+        while not stop.is_set():
+            try:
+                return q.get(timeout=_QUEUE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return None
+
+    def _upload_parts_from_queue(
+        self,
+        parts_queue: queue.Queue,
+        mm: mmap.mmap,
+        upload_urls,
+        etags: dict,
+        stop: threading.Event
+    ) -> None:
+        """
+        Upload parts taken from the queue until an end marker arrives.
+
+        Stops early when another uploader failed; a failure here stops the others.
+
+        Args:
+            parts_queue: Queue of (part_number, start, end) tuples, None marks the end
+            mm: Memory map of the source file
+            upload_urls: Presigned URLs, indexed by part number - 1
+            etags: Dictionary collecting ETags by part number
+            stop: Event signalling that the upload was aborted
+        """
+        while True:
+            item = self._get_until_stopped(parts_queue, stop)
+            if item is None:
+                return
+
+            part_number, start, end = item
+            try:
+                with memoryview(mm)[start:end] as view:
+                    compressed = self._compress_part(view)
+
+                # The pages of this part are not needed anymore
+                _madvise(mm, 'MADV_DONTNEED', start, end)
+
+                etags[part_number] = self._upload_part(upload_urls[part_number - 1], compressed)
+            except Exception as e:
+                logger.error(f"Failed to upload part {part_number}: {e}")
+                stop.set()
+                raise
+
     def _submit_data_pull_request(self, job_request) -> JobDetailResponse:
         submit_request = GeneralJobRequest(actual_instance=job_request)
         job_response = self.jobs_api.submit_job_execution(submit_request)
         logger.debug(f"Job submitted with ID: {job_response.id}")
         return job_response
 
-    def _upload_file(self, url: str, csv_file_path: str) -> None:
+    def _upload_file(self, url: str, csv_file_path: str, file_size: int, encoding: Optional[str] = None) -> None:
         """
         Upload a file to a presigned URL.
         
         Args:
             url: Presigned URL
             csv_file_path: Path to the file to upload
+            file_size: Size of the file in bytes
+            encoding: "gzip" to compress the whole file in memory before sending it, or
+                None to stream it as is
         
         Raises:
             requests.exceptions.RequestException: If upload fails
@@ -243,34 +500,62 @@ class LoadDataClient(BaseClient):
         logger.debug(f"Uploading file to presigned URL")
         
         try:
-            with open(csv_file_path, 'rb') as f:
-                file_size = os.path.getsize(csv_file_path)
-                logger.debug(f"File size: {file_size} bytes")
-                
+            if encoding == "gzip":
+                with open(csv_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        compressed_content = self._compress_part(view).getbuffer()
+                logger.debug(f"Compressed size: {len(compressed_content)} bytes")
+
+                # Sent like multipart parts: a GZIP body without Content-Encoding, so the
+                # stored object is the same whichever path uploaded it
                 headers = {
                     'Content-Type': self.content_type,
-                    'Content-Length': str(file_size)
+                    'Content-Length': str(len(compressed_content))
                 }
+
+                response = self._http.put(url, data=compressed_content, headers=headers, timeout=self.http_timeout)
+            else:
+                with open(csv_file_path, 'rb') as f:
+                    headers = {
+                        'Content-Type': self.content_type,
+                        'Content-Length': str(file_size)
+                    }
+
+                    response = self._http.put(url, data=f, headers=headers, timeout=self.http_timeout)
                 
-                response = requests.put(url, data=f, headers=headers)
-                
-                if response.status_code != 200:
-                    logger.error(f"Upload failed with status {response.status_code}")
-                    logger.error(f"Response content: {response.text}")
-                
-                response.raise_for_status()
+            if response.status_code != 200:
+                logger.error(f"Upload failed with status {response.status_code}")
+                logger.error(f"Response content: {response.text}")
+            
+            response.raise_for_status()
                 
         except Exception as e:
             logger.error(f"Error during file upload: {str(e)}")
             raise
-    
-    def _upload_part(self, url: str, file_path: str) -> str:
+
+    def _compress_part(self, data) -> io.BytesIO:
+        """
+        GZIP compress the content of a part.
+
+        Args:
+            data: Uncompressed content of the part (any bytes-like object)
+
+        Returns:
+            Buffer holding the compressed data
+        """
+        compressed = io.BytesIO()
+        with gzip.GzipFile(fileobj=compressed, mode='wb', compresslevel=1) as gz:
+            gz.write(data)
+        logger.debug(f"Original size: {len(data)} bytes, Compressed size: {compressed.tell()} bytes")
+        return compressed
+
+    def _upload_part(self, url: str, compressed: io.BytesIO) -> str:
         """
         Upload a GZIP compressed part to presigned URL.
         
         Args:
             url: Presigned URL
-            file_path: Path to the file to upload
+            compressed: Buffer holding the compressed part
         
         Returns:
             ETag from the response
@@ -281,23 +566,21 @@ class LoadDataClient(BaseClient):
         logger.debug(f"Uploading GZIP compressed part")
         
         try:
-            # Read and compress the file content
-            with open(file_path, 'rb') as f:
-                file_content = f.read()
-            
-            compressed_content = gzip.compress(file_content)
+            # Hash and send the compressed buffer in place, without copying it to bytes
+            compressed_content = compressed.getbuffer()
             compressed_size = len(compressed_content)
-            logger.debug(
-                f"Original size: {len(file_content)} bytes, "
-                f"Compressed size: {compressed_size} bytes"
-            )
             
+            # Let the storage verify the part integrity on its side
+            digest = hashlib.md5(compressed_content, usedforsecurity=False).digest()
+            md5 = base64.b64encode(digest).decode()
+
             headers = {
                 'Content-Type': self.content_type,
-                'Content-Length': str(compressed_size)
+                'Content-Length': str(compressed_size),
+                'Content-MD5': md5
             }
             
-            response = requests.put(url, data=compressed_content, headers=headers)
+            response = self._http.put(url, data=compressed_content, headers=headers, timeout=self.http_timeout)
             
             if response.status_code != 200:
                 logger.error(f"Upload failed with status {response.status_code}")
@@ -316,40 +599,51 @@ class LoadDataClient(BaseClient):
             logger.error(f"Error during part upload: {str(e)}")
             raise
     
-    def poll_job_status(self, job_id: str, poll_interval: int = 5, timeout: Optional[int] = None) -> bool:
+    def poll_job_status(
+        self,
+        job_id: str,
+        poll_interval: float = DATA_PULL_POLL_INTERVAL,
+        timeout: Optional[int] = None,
+        max_polls: Optional[int] = None
+    ) -> bool:
         """
         Poll the status of a job until it completes or fails.
         
         Args:
             job_id: The ID of the job to poll
-            poll_interval: Seconds between status checks
+            poll_interval: Initial seconds between status checks, doubled after each
+                check up to 10 seconds (default: 0.25)
             timeout: Maximum seconds to wait (None for no timeout)
+            max_polls: Maximum number of status checks before giving up (None for no limit)
         
         Returns:
             True if job succeeded, False if it failed
         
         Raises:
-            TimeoutError: If timeout is reached
+            TimeoutError: If timeout or max_polls is reached
         """
         start_time = time.time()
         
-        while True:
+        for poll, delay in enumerate(self._poll_delays(poll_interval, DATA_PULL_MAX_POLL_INTERVAL, backoff=2)):
             try:
-                job_status = self.jobs_api.get_job_status(job_id, "dataPull")
-                logger.debug(f"Job status: {job_status.status}")
+                job_status = self._fetch_job_status(job_id, _DATA_PULL, poll)
+                logger.debug(f"Job status: {job_status['status']}")
                 
-                if job_status.status == "SUCCEEDED":
+                if job_status['status'] == "SUCCEEDED":
                     logger.info("Job completed successfully")
                     return True
-                elif job_status.status == "FAILED":
-                    logger.error(f"Job failed: {job_status.message}")
+                elif job_status['status'] == "FAILED":
+                    logger.error(f"Job failed: {job_status.get('message')}")
                     return False
                 
                 # Check timeout
                 if timeout and (time.time() - start_time) > timeout:
                     raise TimeoutError(f"Job {job_id} did not complete within {timeout} seconds")
+
+                if max_polls is not None and poll + 1 >= max_polls:
+                    raise TimeoutError(f"Job {job_id} did not complete within the maximum number of status checks")
                 
-                time.sleep(poll_interval)
+                time.sleep(delay)
                 
             except Exception as e:
                 logger.error(f"Error polling job status: {str(e)}")
@@ -365,4 +659,4 @@ class LoadDataClient(BaseClient):
         Returns:
             Job status response
         """
-        return self.jobs_api.get_job_status(job_id, type="dataPull")
+        return self.jobs_api.get_job_status(job_id, type=_DATA_PULL)
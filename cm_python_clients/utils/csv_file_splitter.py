@@ -1,11 +1,18 @@
 import logging
 import os
+import shutil
+import sys
 import tempfile
 from typing import Tuple, Iterator
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Size of the blocks copied between files when in-kernel copying is not available
+READ_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Size of the window scanned when looking for a row boundary
+SCAN_WINDOW_SIZE = 64 * 1024
+
 
 class CSVFileSplitter:
     def __init__(self, chunk_size: int):
@@ -24,16 +31,9 @@ class CSVFileSplitter:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Clean up temporary directory when exiting context."""
-        if self.temp_dir and os.path.exists(self.temp_dir):
-            for file in os.listdir(self.temp_dir):
-                try:
-                    os.remove(os.path.join(self.temp_dir, file))
-                except Exception as e:
-                    logger.warning(f"Failed to remove temporary file {file}: {e}")
-            try:
-                os.rmdir(self.temp_dir)
-            except Exception as e:
-                logger.warning(f"Failed to remove temporary directory: {e}")
+        if self.temp_dir:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir = None
 
     def split_file(self, file_path: str, num_parts: int) -> Iterator[Tuple[str, int]]:
         """Split a CSV file into parts while preserving CSV structure.
@@ -49,54 +49,126 @@ class CSVFileSplitter:
         if not self.temp_dir:
             raise RuntimeError("CSVFileSplitter must be used as a context manager")
 
-        current_part = 1
-        current_size = 0
         current_file = None
-        current_writer = None
 
         try:
-            with open(file_path, 'r', newline='') as f:
-                # Read header
-                header = next(f)
-                header_size = len(header.encode('utf-8'))
-
-                # Create first part file
-                current_file = self._create_temp_file(current_part)
-                current_writer = open(current_file, 'w', newline='')
-                current_writer.write(header)
-                current_size = header_size
-
-                # Read rows
-                for row in f:
-                    row_size = len(row.encode('utf-8'))
-
-                    # If adding this row would exceed chunk size and we're not on the last part,
-                    # close current file and start a new one
-                    if current_size + row_size > self.chunk_size and current_part < num_parts:
-                        current_writer.close()
-                        yield current_file, current_part
-
-                        current_part += 1
-                        current_file = self._create_temp_file(current_part)
-                        current_writer = open(current_file, 'w', newline='')
-                        current_size = header_size
-
-                    current_writer.write(row)
-                    current_size += row_size
-
-                # Close the last file if it exists
-                if current_writer:
-                    current_writer.close()
+            with open(file_path, 'rb') as f:
+                header_size = len(f.readline())
+                file_size = os.fstat(f.fileno()).st_size
+
+                part_ranges = self._part_ranges(f, header_size, file_size, num_parts)
+                for current_part, (start, end) in enumerate(part_ranges, start=1):
+                    current_file = self._create_temp_file(current_part)
+                    with open(current_file, 'wb') as writer:
+                        self._copy_range(f, writer, start, end - start)
                     yield current_file, current_part
 
         except Exception as e:
             # Clean up in case of error
-            if current_writer:
-                current_writer.close()
             if current_file and os.path.exists(current_file):
                 os.remove(current_file)
             raise e
 
+    def split_ranges(self, file_path: str, num_parts: int) -> Iterator[Tuple[int, int, int]]:
+        """Split a CSV file into parts without writing them anywhere.
+        Parts are described by byte ranges of the source file that end on
+        row boundaries; no context manager is needed.
+
+        Args:
+            file_path (str): Path to the CSV file
+            num_parts (int): Number of parts to split into
+
+        Yields:
+            Tuple[int, int, int]: Tuple of (start, end, part_number)
+        """
+        with open(file_path, 'rb') as f:
+            header_size = len(f.readline())
+            file_size = os.fstat(f.fileno()).st_size
+
+            part_ranges = self._part_ranges(f, header_size, file_size, num_parts)
+            for part_number, (start, end) in enumerate(part_ranges, start=1):
+                yield start, end, part_number
+
+    def _part_ranges(self, f, header_size: int, file_size: int, num_parts: int) -> Iterator[Tuple[int, int]]:
+        """Compute the byte ranges of the parts, each ending on a row boundary.
+
+        Only the first part contains the header, but every part reserves room
+        for it in its chunk size.
+
+        Args:
+            f: Source file opened in binary mode
+            header_size (int): Size of the header row in bytes
+            file_size (int): Size of the source file in bytes
+            num_parts (int): Maximum number of parts
+
+        Yields:
+            Tuple[int, int]: Tuple of (start, end) offsets of each part
+        """
+        room = self.chunk_size - header_size
+        start = 0
+        data_start = header_size
+        current_part = 1
+
+        while data_start < file_size or current_part == 1:
+            # The rest fits, or this is the last part
+            if file_size - data_start <= room or current_part == num_parts:
+                yield start, file_size
+                return
+
+            # Cut after the last row that still fits
+            end = self._rfind_newline(f, data_start, data_start + room) + 1
+            if end <= data_start:
+                # A single row larger than the chunk size gets a part of its own
+                end = self._find_newline(f, data_start, file_size) + 1 or file_size
+
+            yield start, end
+            start = data_start = end
+            current_part += 1
+
+    def _rfind_newline(self, f, start: int, end: int) -> int:
+        """Find the offset of the last newline in f[start:end], or -1."""
+        while end > start:
+            window_start = max(start, end - SCAN_WINDOW_SIZE)
+            f.seek(window_start)
+            index = f.read(end - window_start).rfind(b'\n')
+            if index >= 0:
+                return window_start + index
+            end = window_start
+        return -1
+
+    def _find_newline(self, f, start: int, end: int) -> int:
+        """Find the offset of the first newline in f[start:end], or -1."""
+        f.seek(start)
+        while start < end:
+            index = f.read(min(SCAN_WINDOW_SIZE, end - start)).find(b'\n')
+            if index >= 0:
+                return start + index
+            start += SCAN_WINDOW_SIZE
+        return -1
+
+    def _copy_range(self, src, dst, offset: int, count: int) -> None:
+        """Copy count bytes starting at offset from src to dst.
+
+        Uses os.sendfile on Linux, so the data never leaves the kernel;
+        other platforms fall back to a buffered read/write loop.
+        """
+        if sys.platform.startswith('linux'):
+            while count > 0:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, count)
+                if sent == 0:
+                    break
+                offset += sent
+                count -= sent
+            return
+
+        src.seek(offset)
+        while count > 0:
+            buf = src.read(min(READ_BUFFER_SIZE, count))
+            if not buf:
+                break
+            dst.write(buf)
+            count -= len(buf)
+
     def _create_temp_file(self, part_number: int) -> str:
         """Create a temporary file for a part.
 
@@ -0,0 +1,41 @@
+import logging
+import os
+
+import pytest
+
+from cm_python_clients import LoadDataClient
+
+# $CM_LOGLEVEL raises the verbosity of integration runs, e.g. CM_LOGLEVEL=INFO
+logging.basicConfig(level=os.environ.get("CM_LOGLEVEL", "WARNING"))
+
+
+@pytest.fixture(scope="session")
+def access_token() -> str:
+    """CleverMaps access token ($CM_ACCESS_TOKEN)"""
+    return os.environ["CM_ACCESS_TOKEN"]
+
+
+@pytest.fixture(scope="session")
+def project_id() -> str:
+    """CleverMaps project ID ($CM_PROJECT_ID)"""
+    return os.environ["CM_PROJECT_ID"]
+
+
+@pytest.fixture(scope="session")
+def small_csv() -> str:
+    """Path to a CSV file uploaded in a single part ($CM_CSV_PATH)"""
+    return os.environ["CM_CSV_PATH"]
+
+
+@pytest.fixture(scope="session")
+def large_csv() -> str:
+    """Path to a CSV file larger than 50MB, uploaded in parts ($CM_CSV_PATH_MULTIPART)"""
+    return os.environ["CM_CSV_PATH_MULTIPART"]
+
+
+@pytest.fixture
+def offline_client(monkeypatch):
+    """LoadDataClient that skips the token exchange; tests stub the APIs and HTTP calls they use"""
+    monkeypatch.setattr(LoadDataClient, "exchange_token", lambda self, api_token: "bearer")
+    with LoadDataClient("token", max_concurrent_parts=3) as client:
+        yield client
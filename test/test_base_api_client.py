@@ -0,0 +1,72 @@
+from unittest import mock
+
+import pytest
+from cm_python_openapi_sdk import JobDetailResponse
+from cm_python_openapi_sdk.exceptions import ApiException
+
+from cm_python_clients import LoadDataClient
+from cm_python_clients.base_api_client import STATUS_VALIDATION_INTERVAL
+
+
+def stub_status_response(client: LoadDataClient, status: int, body: bytes) -> mock.Mock:
+    """
+    Stub the raw job status call of a client
+
+    Args:
+        client (LoadDataClient): Client to stub
+        status (int): HTTP status of the response
+        body (bytes): Response body
+
+    Returns:
+        mock.Mock: The stubbed raw response
+    """
+    response = mock.Mock(status=status, reason="Status", data=body)
+    response.getheaders.return_value = {}
+    client.jobs_api = mock.Mock()
+    client.jobs_api.get_job_status_without_preload_content.return_value = response
+    return response
+
+
+def test_fetch_job_status(offline_client: LoadDataClient):
+    """Test a 200 status response is parsed into a dictionary and its connection released"""
+    response = stub_status_response(offline_client, 200, b'{"id": "job", "status": "RUNNING"}')
+
+    with mock.patch.object(JobDetailResponse, "from_dict"):
+        job_status = offline_client._fetch_job_status("job", "dataPull")
+
+    assert job_status == {"id": "job", "status": "RUNNING"}
+    offline_client.jobs_api.get_job_status_without_preload_content.assert_called_once_with("job", type="dataPull")
+    response.release_conn.assert_called_once()
+
+
+def test_fetch_job_status_error(offline_client: LoadDataClient):
+    """Test a failed status response raises the SDK exception without a second request"""
+    response = stub_status_response(offline_client, 500, b'{"message": "Internal error"}')
+
+    with pytest.raises(ApiException) as exc_info:
+        offline_client._fetch_job_status("job", "dataPull")
+
+    assert exc_info.value.status == 500
+    offline_client.jobs_api.get_job_status.assert_not_called()
+    offline_client.jobs_api.get_job_status_without_preload_content.assert_called_once()
+    response.release_conn.assert_called_once()
+
+
+@pytest.mark.parametrize("debug", [False, True])
+def test_fetch_job_status_validation(offline_client: LoadDataClient, caplog, debug: bool):
+    """
+    Test only the first poll is validated, plus every STATUS_VALIDATION_INTERVAL-th one with DEBUG logging
+
+    Args:
+        debug (bool): Whether DEBUG logging is enabled for the client
+    """
+    stub_status_response(offline_client, 200, b'{"id": "job", "status": "RUNNING"}')
+    caplog.set_level("DEBUG" if debug else "INFO", logger="cm_python_clients.base_api_client")
+
+    polls = 2 * STATUS_VALIDATION_INTERVAL + 1
+    with mock.patch.object(JobDetailResponse, "from_dict") as from_dict:
+        for poll in range(polls):
+            offline_client._fetch_job_status("job", "dataPull", poll)
+
+    assert from_dict.call_count == (3 if debug else 1)
+    from_dict.assert_called_with({"id": "job", "status": "RUNNING"})
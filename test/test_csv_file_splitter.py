@@ -0,0 +1,176 @@
+import io
+import random
+
+import pytest
+
+from cm_python_clients.utils import csv_file_splitter
+from cm_python_clients.utils.csv_file_splitter import CSVFileSplitter
+
+HEADER = b"id,name,value\n"
+
+
+@pytest.fixture(params=[csv_file_splitter.SCAN_WINDOW_SIZE, 7], ids=["default-window", "small-window"])
+def scan_window(request, monkeypatch) -> int:
+    """Run each test with the default scan window and with one smaller than most rows"""
+    monkeypatch.setattr(csv_file_splitter, "SCAN_WINDOW_SIZE", request.param)
+    return request.param
+
+
+def write_csv(tmp_path, data: bytes) -> str:
+    """
+    Write CSV content to a temporary file
+
+    Args:
+        tmp_path: pytest temporary directory
+        data (bytes): File content
+
+    Returns:
+        str: Path to the file
+    """
+    path = tmp_path / "data.csv"
+    path.write_bytes(data)
+    return str(path)
+
+
+def split(path: str, chunk_size: int, num_parts: int) -> list:
+    """
+    Split a file with split_ranges and read the parts back
+
+    Args:
+        path (str): Path to the CSV file
+        chunk_size (int): Target size of a part in bytes
+        num_parts (int): Maximum number of parts
+
+    Returns:
+        list: Content of the parts, in order
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    parts = []
+    for start, end, part_number in CSVFileSplitter(chunk_size).split_ranges(path, num_parts):
+        assert part_number == len(parts) + 1
+        parts.append(data[start:end])
+    return parts
+
+
+def row_by_row_ranges(data: bytes, chunk_size: int, num_parts: int) -> list:
+    """
+    Part boundaries of the original row-by-row splitter
+
+    Every part reserves room for the header, a row that does not fit starts a
+    new part, and the last allowed part takes the rest of the file.
+
+    Args:
+        data (bytes): File content
+        chunk_size (int): Target size of a part in bytes
+        num_parts (int): Maximum number of parts
+
+    Returns:
+        list: (start, end) offsets of the parts
+    """
+    rows = io.BytesIO(data).readlines()
+    header_size = len(rows[0])
+
+    ranges = []
+    offset = header_size
+    part_start = 0
+    current_size = header_size
+    for row in rows[1:]:
+        if current_size + len(row) > chunk_size and len(ranges) + 1 < num_parts:
+            ranges.append((part_start, offset))
+            part_start = offset
+            current_size = header_size
+        current_size += len(row)
+        offset += len(row)
+    ranges.append((part_start, len(data)))
+    return ranges
+
+
+def test_parts_reassemble_to_file(tmp_path, scan_window):
+    """Parts cover the whole file, in order, without gaps or overlaps"""
+    data = HEADER + b"".join(b"%d,row %d,%d\n" % (i, i, i * i) for i in range(500))
+    parts = split(write_csv(tmp_path, data), chunk_size=300, num_parts=100)
+
+    assert len(parts) > 1
+    assert b"".join(parts) == data
+
+
+def test_parts_end_on_row_boundary(tmp_path, scan_window):
+    """Every part ends with a newline and only the first one contains the header"""
+    data = HEADER + b"".join(b"%d,row %d,%d\n" % (i, i, i * i) for i in range(500))
+    parts = split(write_csv(tmp_path, data), chunk_size=300, num_parts=100)
+
+    assert all(part.endswith(b"\n") for part in parts)
+    assert parts[0].startswith(HEADER)
+    assert not any(part.startswith(HEADER) for part in parts[1:])
+    # Every part leaves room for the header within the chunk size
+    assert all(len(part) + len(HEADER) <= 300 for part in parts[1:])
+
+
+def test_last_part_takes_the_rest(tmp_path, scan_window):
+    """Once num_parts is reached, the last part holds the rest of the file regardless of its size"""
+    data = HEADER + b"".join(b"%d,row %d,%d\n" % (i, i, i * i) for i in range(500))
+    parts = split(write_csv(tmp_path, data), chunk_size=300, num_parts=3)
+
+    assert len(parts) == 3
+    assert len(parts[-1]) > 300
+    assert b"".join(parts) == data
+
+
+def test_long_row_gets_own_part(tmp_path, scan_window):
+    """A row longer than the chunk size is not cut, it becomes a part of its own"""
+    long_row = b"1," + b"x" * 1000 + b",1\n"
+    data = HEADER + b"0,a,0\n" + long_row + b"2,b,4\n"
+    parts = split(write_csv(tmp_path, data), chunk_size=100, num_parts=10)
+
+    assert parts == [HEADER + b"0,a,0\n", long_row, b"2,b,4\n"]
+
+
+def test_no_trailing_newline(tmp_path, scan_window):
+    """The last row may lack a newline; it still ends up, unchanged, in the last part"""
+    data = HEADER + b"".join(b"%d,row %d,%d\n" % (i, i, i * i) for i in range(50)) + b"50,last,2500"
+    parts = split(write_csv(tmp_path, data), chunk_size=200, num_parts=100)
+
+    assert b"".join(parts) == data
+    assert parts[-1].endswith(b"50,last,2500")
+    assert all(part.endswith(b"\n") for part in parts[:-1])
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_row_by_row_split(tmp_path, scan_window, seed: int):
+    """
+    Boundaries equal those of the original row-by-row splitter when no row is longer than the chunk
+
+    Args:
+        seed (int): Seed of the random file and split parameters
+    """
+    rng = random.Random(seed)
+    rows = [
+        b",".join(b"x" * rng.randint(0, 30) for _ in range(rng.randint(1, 4))) + b"\n"
+        for _ in range(rng.randint(1, 200))
+    ]
+    data = HEADER + b"".join(rows)
+    if rng.random() < 0.3:
+        data = data[:-1]
+    chunk_size = rng.randint(len(HEADER) + max(map(len, rows)), 600)
+    num_parts = rng.randint(1, 12)
+
+    path = write_csv(tmp_path, data)
+    ranges = [(start, end) for start, end, _ in CSVFileSplitter(chunk_size).split_ranges(path, num_parts)]
+
+    assert ranges == row_by_row_ranges(data, chunk_size, num_parts)
+
+
+def test_split_file_matches_ranges(tmp_path, scan_window):
+    """split_file writes exactly the ranges reported by split_ranges"""
+    data = HEADER + b"".join(b"%d,row %d,%d\n" % (i, i, i * i) for i in range(500))
+    path = write_csv(tmp_path, data)
+
+    with CSVFileSplitter(300) as splitter:
+        written = []
+        for part_path, part_number in splitter.split_file(path, 100):
+            with open(part_path, 'rb') as f:
+                written.append(f.read())
+
+    assert written == split(path, chunk_size=300, num_parts=100)
@@ -1,7 +1,12 @@
+import logging
+import os
+
 import pytest
 
 from cm_python_clients import DataDumpClient
 
+logger = logging.getLogger(__name__)
+
 @pytest.mark.skip(reason="Integration test - run manually with actual credentials")
 def real_dump_dataset_to_csv(project_id: str, dataset: str, output_path: str, access_token: str):
     """
@@ -17,12 +22,11 @@ def real_dump_dataset_to_csv(project_id: str, dataset: str, output_path: str, ac
 
     output_file = sdk.dump_dataset_to_csv(project_id, dataset, output_path)
 
-    print(f"Data dump completed:")
-    print(f"Output file: {output_file}")
+    logger.info("Data dump completed, output file: %s", output_file)
 
     with open(output_file, 'r') as f:
         content = f.read()
-        print(f"File content length: {len(content)}")
+        logger.info("File content length: %d", len(content))
 
 
 if __name__ == "__main__":
@@ -32,6 +36,8 @@ if __name__ == "__main__":
     DATASET = ""  # Replace with your dataset name
     OUTPUT_PATH = ""  # Replace with your desired output path
 
+    logging.basicConfig(level=os.environ.get("CM_LOGLEVEL", "INFO"))
+
     # Test real data dump
-    print("\nTesting real data dump:")
+    logger.info("Testing real data dump")
     real_dump_dataset_to_csv(PROJECT_ID, DATASET, OUTPUT_PATH, ACCESS_TOKEN)
\ No newline at end of file
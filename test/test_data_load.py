@@ -1,77 +1,367 @@
+import base64
+import gzip
+import hashlib
+import logging
+import os
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import SimpleNamespace
+from unittest import mock
+
 import pytest
+import requests
+from cm_python_openapi_sdk import DataPullRequestCsvOptions
+
+from cm_python_clients.base_api_client import TRANSFER_POOL_MAXSIZE
+from cm_python_clients.load_data_client import LoadDataClient, adaptive_part_size, _check_csv_header, \
+    HEADER_SNIFF_SIZE, MAX_CONCURRENT_PARTS_ENV, MAX_PART_COUNT, MAX_PART_SIZE, MIN_PART_SIZE, \
+    STORAGE_MAX_PART_SIZE, STORAGE_MIN_PART_SIZE
+
+integration = pytest.mark.skipif(
+    not os.environ.get("CM_INTEGRATION"),
+    reason="Integration test - set CM_INTEGRATION=1 and the CM_* credentials to run"
+)
+
+logger = logging.getLogger(__name__)
+
+# Allowance for the HTTP client and SDK objects allocated during an upload
+UPLOAD_MEMORY_OVERHEAD = 4 * 1024 * 1024
 
-from cm_python_clients.load_data_client import LoadDataClient
+MiB = 1024 * 1024
+GiB = 1024 * MiB
 
-@pytest.mark.skip(reason="Integration test - run manually with actual credentials")
-def test_single_part_upload(csv_path: str, project_id: str, access_token: str):
+
+@pytest.fixture(scope="session")
+def load_data_client(access_token: str):
+    client = LoadDataClient(access_token)
+    yield client
+    client.close()
+
+
+def upload_and_poll(
+    load_data_client: LoadDataClient,
+    csv_path: str,
+    project_id: str,
+    dataset: str,
+    check_memory: bool = True
+):
     """
-    Test single-part CSV upload (for files <= 50MB)
+    Upload a CSV file and wait for the data pull job
 
     Args:
+        load_data_client (LoadDataClient): Client to upload with
         csv_path (str): Path to the CSV file
         project_id (str): CleverMaps project ID
-        config: Configured API client configuration
+        dataset (str): Name of the dataset to load into
+        check_memory (bool): Assert the peak memory of the upload; tracemalloc is
+            process-wide, so disable this when uploads run concurrently
     """
+    file_size = os.path.getsize(csv_path)
+    part_size = adaptive_part_size(file_size)
 
-    load_data_client = LoadDataClient(access_token)
+    if check_memory:
+        tracemalloc.start()
+    try:
+        response = load_data_client.upload_data(
+            project_id=project_id,
+            csv_file_path=csv_path,
+            dataset_name=dataset,
+            poll_job=False,
+            encoding="gzip"
+        )
+        if check_memory:
+            _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if check_memory:
+            tracemalloc.stop()
 
-    response = load_data_client.upload_data(
-        project_id=project_id,
-        csv_file_path=csv_path,
-        dataset_name="stores"
-    )
+    if check_memory:
+        if file_size <= load_data_client.chunk_size:
+            # The single-part body is compressed in memory as a whole
+            limit = file_size
+        else:
+            # Parts are read through a memory map, so allocations are bounded by the
+            # compressed parts in flight, not by the file size
+            limit = (load_data_client.max_concurrent_parts + 1) * part_size
+        assert peak < limit + UPLOAD_MEMORY_OVERHEAD
 
-    print(f"Single-part upload completed:")
-    print(f"Job ID: {response.id}")
-    print(f"Job Status: {response.status}")
+    logger.info("Upload of %s completed", csv_path)
+    if file_size > load_data_client.chunk_size:
+        logger.info("Part size: %d bytes, parts: %d", part_size, -(-file_size // part_size))
+    logger.info("Job ID: %s", response.id)
+    logger.info("Job Status: %s", response.status)
 
-    success = load_data_client.poll_job_status(response.id, poll_interval=5)
+    success = load_data_client.poll_job_status(response.id)
 
     if success:
-        print(f"Job {response.id} completed successfully")
+        logger.info("Job %s completed successfully", response.id)
     else:
-        print(f"Job {response.id} failed")
+        logger.warning("Job %s failed", response.id)
+
 
-@pytest.mark.skip(reason="Integration test - run manually with actual credentials")
-def test_multipart_upload(csv_path: str, project_id: str, access_token: str):
+@pytest.mark.parametrize("file_size, part_size", [
+    (0, MIN_PART_SIZE),
+    (50 * MiB, MIN_PART_SIZE),
+    (16 * GiB, -(-16 * GiB // 1000)),       # about 1000 parts
+    (1024 * GiB, MAX_PART_SIZE),            # capped, more parts instead
+    (2048 * GiB, -(-2048 * GiB // MAX_PART_COUNT)),  # part count limit wins
+])
+def test_adaptive_part_size(file_size: int, part_size: int):
     """
-    Test multipart CSV upload (for files > 50MB)
+    Test part sizes stay within their bounds and the part count within the storage limit
 
     Args:
-        csv_path (str): Path to the CSV file
-        project_id (str): CleverMaps project ID
-        config: Configured API client configuration
+        file_size (int): Size of the file in bytes
+        part_size (int): Expected part size in bytes
+    """
+    assert adaptive_part_size(file_size) == part_size
+    assert -(-file_size // part_size) <= MAX_PART_COUNT
+
+
+@pytest.mark.parametrize("content", [
+    b"id,name\n1,a\n",
+    b"id,name",                             # header only, no trailing newline
+    b"x" * (HEADER_SNIFF_SIZE - 1) + b"\n" + b"1\n",
+    b"x" * HEADER_SNIFF_SIZE * 2 + b"\n1\n",  # header row longer than the sniffed bytes
+])
+def test_check_csv_header_accepts(tmp_path, content: bytes):
+    """
+    Test files starting with a header row pass the header check, however long the row
+
+    Args:
+        content (bytes): Content of the CSV file
+    """
+    path = tmp_path / "data.csv"
+    path.write_bytes(content)
+    _check_csv_header(str(path))
+
+
+@pytest.mark.parametrize("content", [
+    b"",
+    b" \n\n",
+])
+def test_check_csv_header_rejects(tmp_path, content: bytes):
+    """
+    Test empty and blank files are rejected
+
+    Args:
+        content (bytes): Content of the CSV file
+    """
+    path = tmp_path / "data.csv"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        _check_csv_header(str(path))
+
+
+def test_poll_delays():
+    """Test poll delays back off exponentially up to the maximum, with at most 10% jitter"""
+    delays = LoadDataClient._poll_delays(0.25, 10.0, backoff=2)
+    expected = [0.25, 0.5, 1, 2, 4, 8, 10, 10, 10]
+    for base in expected:
+        assert base <= next(delays) <= base * 1.1
+
+
+def test_poll_delays_interval_above_maximum():
+    """Test an initial interval above the maximum is kept rather than lowered"""
+    delays = LoadDataClient._poll_delays(60, 30)
+    for _ in range(5):
+        assert 60 <= next(delays) <= 66
+
+
+@pytest.mark.parametrize("max_concurrent_parts", [0, -1])
+def test_invalid_max_concurrent_parts(max_concurrent_parts: int):
+    """
+    Test a non-positive number of concurrent parts is rejected before any API call
+
+    Args:
+        max_concurrent_parts (int): Invalid number of concurrent parts
+    """
+    with pytest.raises(ValueError):
+        LoadDataClient("token", max_concurrent_parts=max_concurrent_parts)
+
+
+def test_invalid_max_concurrent_parts_env(monkeypatch):
+    """Test a non-positive $CM_MAX_CONCURRENT_PARTS is rejected before any API call"""
+    monkeypatch.setenv(MAX_CONCURRENT_PARTS_ENV, "0")
+    with pytest.raises(ValueError):
+        LoadDataClient("token")
+
+
+@pytest.mark.parametrize("max_concurrent_parts, pool_maxsize", [
+    (8, TRANSFER_POOL_MAXSIZE),
+    (TRANSFER_POOL_MAXSIZE * 2, TRANSFER_POOL_MAXSIZE * 2),
+])
+def test_transfer_pool_size(monkeypatch, max_concurrent_parts: int, pool_maxsize: int):
+    """
+    Test the transfer connection pool holds a connection for every concurrent part
+
+    Args:
+        max_concurrent_parts (int): Number of parts uploaded in parallel
+        pool_maxsize (int): Expected number of pooled connections per host
+    """
+    monkeypatch.setattr(LoadDataClient, "exchange_token", lambda self, api_token: "bearer")
+    with LoadDataClient("token", max_concurrent_parts=max_concurrent_parts) as client:
+        adapter = client._http.get_adapter("https://storage.test/part-1")
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == pool_maxsize
+
+
+@pytest.mark.parametrize("part_size", [0, -1, STORAGE_MIN_PART_SIZE - 1, STORAGE_MAX_PART_SIZE + 1])
+def test_invalid_part_size(tmp_path, offline_client: LoadDataClient, part_size: int):
+    """
+    Test a part size outside the storage limits is rejected before any API call
+
+    Args:
+        offline_client (LoadDataClient): Client without a token exchange
+        part_size (int): Invalid part size in bytes
+    """
+    path = tmp_path / "data.csv"
+    path.write_bytes(b"id,name\n1,a\n")
+    offline_client.data_upload_api = mock.Mock()
+
+    with pytest.raises(ValueError):
+        offline_client.upload_data("project", str(path), "dataset", part_size=part_size)
+    offline_client.data_upload_api.data_upload.assert_not_called()
+
+
+def stub_multipart_upload(client: LoadDataClient, parts: int, failing_part: int = None) -> dict:
+    """
+    Stub the data upload API and the part PUTs of a client
+
+    Args:
+        client (LoadDataClient): Client to stub
+        parts (int): Number of presigned part URLs returned by the upload init
+        failing_part (int): Part number whose PUT fails with HTTP 500 (default: none)
+
+    Returns:
+        dict: Request bodies received so far, by part number
     """
-    load_data_client = LoadDataClient(access_token)
+    client.data_upload_api = mock.Mock()
+    client.data_upload_api.data_upload.return_value = SimpleNamespace(actual_instance=SimpleNamespace(
+        upload_urls_encoded=[f"https://storage.test/part-{n}" for n in range(1, parts + 1)],
+        id="upload",
+        upload_id="multipart",
+        links=[{"rel": "self", "href": "/rest/projects/project/md/uploads/upload"}]
+    ))
+    client.jobs_api = mock.Mock()
+
+    received = {}
+
+    def put(url, data, headers, timeout):
+        part_number = int(url.rsplit("-", 1)[1])
+        body = bytes(data)
+        assert headers["Content-MD5"] == base64.b64encode(hashlib.md5(body).digest()).decode()
+        received[part_number] = body
+
+        # Finish parts out of order
+        time.sleep(0.01 * (part_number % 3))
+
+        response = mock.Mock(status_code=200, headers={"ETag": f'"etag-{part_number}"'})
+        if part_number == failing_part:
+            response.status_code = 500
+            response.raise_for_status.side_effect = requests.HTTPError("500 Server Error")
+        return response
 
-    response = load_data_client.upload_data(
-        project_id=project_id,
-        csv_file_path=csv_path,
-        dataset_name="zsj_d_dwh"
+    client._http.put = put
+    return received
+
+
+def test_multipart_upload(tmp_path, offline_client: LoadDataClient):
+    """Test multipart parts reassemble to the file and are completed with sorted, complete ETags"""
+    data = b"id,name,value\n" + b"".join(b"%d,row %d,%d\n" % (i, i, i * i) for i in range(5000))
+    path = tmp_path / "data.csv"
+    path.write_bytes(data)
+    part_size = 8 * 1024
+    parts = -(-len(data) // part_size)
+    received = stub_multipart_upload(offline_client, parts)
+
+    offline_client._multipart_upload(
+        "project", str(path), parts, part_size, "dataset", "full", DataPullRequestCsvOptions()
     )
 
-    print(f"Multipart upload completed:")
-    print(f"Job ID: {response.id}")
-    print(f"Job Status: {response.status}")
+    assert len(received) > 1
+    assert b"".join(gzip.decompress(received[n]) for n in sorted(received)) == data
 
-    success = load_data_client.poll_job_status(response.id, poll_interval=5)
+    complete = offline_client.data_upload_api.complete_multipart_upload.call_args.kwargs
+    part_etags = complete["data_complete_multipart_upload_request"].to_dict()["partETags"]
+    assert part_etags == [
+        {"eTag": f'"etag-{n}"', "partNumber": n}
+        for n in range(1, len(received) + 1)
+    ]
+    offline_client.jobs_api.submit_job_execution.assert_called_once()
 
-    if success:
-        print(f"Job {response.id} completed successfully")
-    else:
-        print(f"Job {response.id} failed")
+
+def test_multipart_upload_failing_part(tmp_path, offline_client: LoadDataClient):
+    """Test a failing part aborts the upload promptly, without hanging the part producer"""
+    data = b"id,name,value\n" + b"".join(b"%d,row %d,%d\n" % (i, i, i * i) for i in range(20000))
+    path = tmp_path / "data.csv"
+    path.write_bytes(data)
+    part_size = 4 * 1024
+    parts = -(-len(data) // part_size)
+    received = stub_multipart_upload(offline_client, parts, failing_part=2)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        upload = executor.submit(
+            offline_client._multipart_upload,
+            "project", str(path), parts, part_size, "dataset", "full", DataPullRequestCsvOptions()
+        )
+        with pytest.raises(requests.HTTPError):
+            upload.result(timeout=30)
+
+    assert len(received) < parts
+    offline_client.data_upload_api.complete_multipart_upload.assert_not_called()
+    offline_client.jobs_api.submit_job_execution.assert_not_called()
+
+
+def test_single_part_gzip_upload(tmp_path, offline_client: LoadDataClient):
+    """Test a GZIP single-part upload sends the compressed file like a multipart part, without Content-Encoding"""
+    data = b"id,name\n" + b"".join(b"%d,row %d\n" % (i, i) for i in range(1000))
+    path = tmp_path / "data.csv"
+    path.write_bytes(data)
+    put = mock.Mock(return_value=mock.Mock(status_code=200))
+    offline_client._http.put = put
+
+    offline_client._upload_file("https://storage.test/file", str(path), len(data), encoding="gzip")
+
+    headers = put.call_args.kwargs["headers"]
+    body = bytes(put.call_args.kwargs["data"])
+    assert "Content-Encoding" not in headers
+    assert headers["Content-Length"] == str(len(body))
+    assert gzip.decompress(body) == data
+
+
+@integration
+@pytest.mark.parametrize("csv_fixture, dataset", [
+    ("small_csv", "stores"),      # single-part upload (<= 50MB)
+    ("large_csv", "zsj_d_dwh"),   # multipart upload (> 50MB)
+])
+def test_upload(request, load_data_client: LoadDataClient, project_id: str, csv_fixture: str, dataset: str):
+    """
+    Test single-part and multipart CSV upload
+
+    Args:
+        load_data_client (LoadDataClient): Shared client fixture
+        project_id (str): CleverMaps project ID
+        csv_fixture (str): Name of the fixture providing the CSV path
+        dataset (str): Name of the dataset to load into
+    """
+    upload_and_poll(load_data_client, request.getfixturevalue(csv_fixture), project_id, dataset)
 
 
 if __name__ == "__main__":
     PROJECT_ID = ""  # Replace with your CleverMaps project ID
     ACCESS_TOKEN = ""
-    DATASET = ""  # Replace with your dataset name
     CSV_PATH = ""  # Replace with your desired output path
     CSV_PATH_MULTIPART = ""
-    # Test single-part upload
-    print("\nTesting single-part upload:")
-    test_single_part_upload(CSV_PATH, PROJECT_ID, ACCESS_TOKEN)
 
-    # Test multipart upload
-    print("\nTesting multipart upload:")
-    test_multipart_upload(CSV_PATH_MULTIPART, PROJECT_ID, ACCESS_TOKEN)
\ No newline at end of file
+    logging.basicConfig(level=os.environ.get("CM_LOGLEVEL", "INFO"))
+
+    # Both uploads target independent datasets, so run them side by side on one shared client
+    with LoadDataClient(ACCESS_TOKEN) as client, ThreadPoolExecutor(max_workers=2) as executor:
+        uploads = {
+            executor.submit(upload_and_poll, client, CSV_PATH, PROJECT_ID, "stores", False): "single-part",
+            executor.submit(upload_and_poll, client, CSV_PATH_MULTIPART, PROJECT_ID, "zsj_d_dwh", False): "multipart",
+        }
+        for upload in as_completed(uploads):
+            upload.result()
+            logger.info("Finished %s upload", uploads[upload])